@@ -10,20 +10,36 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+import functools
 import hashlib
 import json
+import re
 import time
 import random
+import secrets
 import base64
 from io import BytesIO
 import qrcode
 from PIL import Image
-import uuid
 import asyncio
-from typing import Dict, List, Any, Optional
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import requests
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
+
+import mining
+import mining_gpu
+import mining_jit
+
+try:
+    import solcx
+except ImportError:  # py-solc-x is optional; compile output is simulated without it
+    solcx = None
 
 # Page Configuration
 st.set_page_config(
@@ -34,128 +50,20 @@ st.set_page_config(
 )
 
 # Custom CSS for enhanced UI
-st.markdown("""
-<style>
-    .main {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 0;
-    }
-
-    .stApp {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
-
-    .block-card {
-        background: white;
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        border-left: 4px solid #667eea;
-    }
-
-    .transaction-card {
-        background: #f8f9fa;
-        border-radius: 8px;
-        padding: 15px;
-        margin: 10px 0;
-        border: 1px solid #dee2e6;
-    }
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
 
-    .success-box {
-        background: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-        padding: 15px;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
 
-    .process-step {
-        background: white;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        transition: all 0.3s;
-    }
+@st.cache_resource
+def load_css() -> str:
+    """Read and minify the stylesheet once per server process"""
+    with open(CSS_PATH) as f:
+        css = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.S)
+    return "<style>" + re.sub(r"\s+", " ", css).strip() + "</style>"
 
-    .process-step:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
 
-    .code-block {
-        background: #2d2d2d;
-        color: #f8f8f2;
-        padding: 15px;
-        border-radius: 5px;
-        font-family: 'Courier New', monospace;
-        margin: 10px 0;
-    }
-
-    .metric-card {
-        background: white;
-        border-radius: 10px;
-        padding: 20px;
-        text-align: center;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    }
-
-    .metric-value {
-        font-size: 2.5em;
-        font-weight: bold;
-        color: #667eea;
-    }
-
-    .metric-label {
-        color: #6c757d;
-        font-size: 0.9em;
-        margin-top: 5px;
-    }
-
-    .file-upload-zone {
-        border: 2px dashed #667eea;
-        border-radius: 10px;
-        padding: 30px;
-        text-align: center;
-        background: #f8f9fa;
-        transition: all 0.3s;
-    }
-
-    .file-upload-zone:hover {
-        background: #e9ecef;
-        border-color: #764ba2;
-    }
-
-    .blockchain-selector {
-        background: white;
-        padding: 15px;
-        border-radius: 10px;
-        margin: 10px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-
-    .status-indicator {
-        display: inline-block;
-        width: 10px;
-        height: 10px;
-        border-radius: 50%;
-        margin-right: 5px;
-    }
-
-    .status-online {
-        background: #28a745;
-        animation: pulse 2s infinite;
-    }
-
-    @keyframes pulse {
-        0% { box-shadow: 0 0 0 0 rgba(40, 167, 69, 0.4); }
-        70% { box-shadow: 0 0 0 10px rgba(40, 167, 69, 0); }
-        100% { box-shadow: 0 0 0 0 rgba(40, 167, 69, 0); }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Elements not re-emitted are dropped on rerun, so the style tag is sent
+# every run; only the file read and minification are cached
+st.markdown(load_css(), unsafe_allow_html=True)
 
 
 # Blockchain Types
@@ -165,12 +73,58 @@ class BlockchainType(Enum):
     CORDA = "Corda"
 
 
+# Blockchain networks (static, read-only metadata)
+NETWORKS = MappingProxyType({
+    'besu': MappingProxyType({
+        'name': 'Hyperledger Besu',
+        'type': 'EVM-Compatible',
+        'consensus': 'IBFT 2.0',
+        'tps': 3500,
+        'block_time': 2,
+        'gas_price': 20,
+        'validators': 4,
+        'status': 'online',
+        'color': '#627EEA',
+        'pow_nibbles': 3
+    }),
+    'fabric': MappingProxyType({
+        'name': 'Hyperledger Fabric',
+        'type': 'Permissioned',
+        'consensus': 'Raft',
+        'tps': 3000,
+        'block_time': 1,
+        'gas_price': 0,
+        'validators': 3,
+        'status': 'online',
+        'color': '#00C853',
+        'pow_nibbles': 2
+    }),
+    'corda': MappingProxyType({
+        'name': 'Corda',
+        'type': 'Permissioned',
+        'consensus': 'Notary',
+        'tps': 1500,
+        'block_time': 3,
+        'gas_price': 0,
+        'validators': 2,
+        'status': 'online',
+        'color': '#E91E63',
+        'pow_nibbles': 2
+    })
+})
+
+# Per-chain columns in NETWORKS order, for widget options and charts
+CHAIN_IDS = tuple(NETWORKS)
+CHAIN_NAMES = tuple(network['name'] for network in NETWORKS.values())
+CHAIN_COLORS = tuple(network['color'] for network in NETWORKS.values())
+
+
 # Data Classes
 @dataclass
 class Block:
     index: int
     timestamp: str
-    transactions: List[Dict]
+    transactions: List[str]  # Transaction ids, resolved via tx_index
     previous_hash: str
     hash: str
     nonce: int
@@ -215,13 +169,318 @@ class FileRecord:
     owner: str
 
 
+def _short_hex(data: bytes, nhex: int) -> str:
+    """First nhex hex digits of SHA-256(data), hex-encoding only those bytes"""
+    return hashlib.sha256(data).digest()[:(nhex + 1) // 2].hex()[:nhex]
+
+
+def _file_sha256(file) -> str:
+    """Hex SHA-256 of a binary file object, read in chunks from its position"""
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+
+        return hashlib.file_digest(file, "sha256").hexdigest()
+    h = hashlib.sha256()
+    for chunk in iter(lambda: file.read(1 << 16), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def qr_png(payload: str) -> bytes:
+    """Render a QR code for payload as PNG bytes.
+
+    The upload receipt stays in session state and is redrawn on every
+    rerun; the cache keeps those redraws from re-encoding the image.
+    """
+    buf = BytesIO()
+    qrcode.make(payload, box_size=10, border=5).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def files_frame(signature: tuple, _files: List[FileRecord]) -> pd.DataFrame:
+    """Uploaded-files table, rebuilt only when signature (count, last id) changes"""
+    # vars() is a shallow view; asdict() would deep-copy every record
+    df = pd.DataFrame([vars(f) for f in _files])
+    df['size'] = df['size'].apply(lambda x: f"{x:,} bytes")
+    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
+    return df[['name', 'size', 'blockchain', 'timestamp', 'ipfs_hash']]
+
+
+@functools.lru_cache(maxsize=256)
+def _deterministic_bytecode(code: str) -> str:
+    """Mock bytecode for contract source; redeploying a template reuses it"""
+    return '0x' + hashlib.sha256(code.encode()).hexdigest()
+
+
+@st.cache_resource
+def solc_available() -> bool:
+    """py-solc-x is installed and has a solc binary to run"""
+    return solcx is not None and bool(solcx.get_installed_solc_versions())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def compile_contract(source: str, optimize_runs: int = 200) -> Dict[str, Any]:
+    """Compile Solidity source, cached by source text and optimizer settings.
+
+    Uses solc through py-solc-x when a compiler is installed; otherwise the
+    output is simulated from the source length. Compiler errors are returned
+    under 'error' so a failing source is not recompiled either.
+    """
+    if not solc_available():
+        return {'bytecode_size': len(source) * 2, 'compiler': "Solidity 0.8.19",
+                'optimize_runs': optimize_runs}
+
+    try:
+        output = solcx.compile_source(source, output_values=['bin'],
+                                      optimize=True, optimize_runs=optimize_runs)
+    except solcx.exceptions.SolcError as e:
+        return {'error': e.stderr_data or str(e)}
+    return {
+        'bytecode_size': max(len(c['bin']) // 2 for c in output.values()),
+        'compiler': f"Solidity {solcx.get_solc_version()}",
+        'optimize_runs': optimize_runs,
+    }
+
+
+# Starter Solidity sources for the contract editor; templates without their
+# own source start from "default"
+TEMPLATES = {
+    "ERC-20 Token": """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract KazToken {
+    string public name = "KazToken";
+    string public symbol = "KZT";
+    uint8 public decimals = 18;
+    uint256 public totalSupply = 1000000 * 10**18;
+
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor() {
+        balanceOf[msg.sender] = totalSupply;
+    }
+
+    function transfer(address to, uint256 amount) public returns (bool) {
+        require(balanceOf[msg.sender] >= amount, "Insufficient balance");
+        balanceOf[msg.sender] -= amount;
+        balanceOf[to] += amount;
+        emit Transfer(msg.sender, to, amount);
+        return true;
+    }
+}""",
+    "ERC-721 NFT": """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+contract KazNFT {
+    string public name = "Kazakhstan Digital Art";
+    string public symbol = "KAZART";
+    uint256 private _tokenIds;
+
+    mapping(uint256 => address) private _owners;
+    mapping(address => uint256) private _balances;
+    mapping(uint256 => string) private _tokenURIs;
+
+    event Transfer(address indexed from, address indexed to, uint256 indexed tokenId);
+    event Mint(address indexed to, uint256 indexed tokenId, string tokenURI);
+
+    function mint(address to, string memory tokenURI) public returns (uint256) {
+        _tokenIds++;
+        uint256 newTokenId = _tokenIds;
+
+        _owners[newTokenId] = to;
+        _balances[to]++;
+        _tokenURIs[newTokenId] = tokenURI;
+
+        emit Transfer(address(0), to, newTokenId);
+        emit Mint(to, newTokenId, tokenURI);
+
+        return newTokenId;
+    }
+
+    function ownerOf(uint256 tokenId) public view returns (address) {
+        return _owners[tokenId];
+    }
+}""",
+    "default": """// Your smart contract code here
+pragma solidity ^0.8.0;
+
+contract MyContract {
+    // Contract implementation
+}""",
+}
+
+# Cards of the transaction-flow walkthrough, rendered side by side in one
+# markdown call (the .process-steps grid in style.css)
+_STEP_HTML = '<div class="process-step"><h4>{title}</h4>{body}</div>'
+
+
+def _step_card(title: str, *lines: str) -> str:
+    return _STEP_HTML.format(title=title, body="".join(f"<p>{line}</p>" for line in lines))
+
+
+_TX_CREATION_HTML = '<div class="process-steps">{}{}</div>'.format(
+    _step_card("Transaction Data",
+               "From: 0x742d35Cc...7595f0bEb7", "To: 0x5aAeb6...642138b79",
+               "Amount: 100 KZT", "Gas: 21000"),
+    _step_card("Digital Signature",
+               "Private key signs transaction", "Signature: 0x3f4e8b2a...",
+               "Verified by network"),
+)
+
+
+# Chart figures. Their inputs are constants (or, for the volume chart, a
+# handful of counters), so each figure is built once and shared by every
+# rerun and session; reruns only serialize it in st.plotly_chart.
+
+def _gauge(value: float, unit: str, axis_range: list, bar_color: str,
+           steps: List[tuple]) -> go.Figure:
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=value,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': unit},
+        gauge={'axis': {'range': axis_range},
+               'bar': {'color': bar_color},
+               'steps': [{'range': [lo, hi], 'color': color} for lo, hi, color in steps]}
+    ))
+    fig.update_layout(height=200, margin=dict(l=0, r=0, t=0, b=0))
+    return fig
+
+
+@st.cache_resource
+def gauge_tps() -> go.Figure:
+    return _gauge(7500, "TPS", [None, 10000], "#667eea", [
+        (0, 2500, "#f0f0f0"), (2500, 5000, "#e0e0e0"),
+        (5000, 7500, "#d0d0d0"), (7500, 10000, "#c0c0c0"),
+    ])
+
+
+@st.cache_resource
+def gauge_latency() -> go.Figure:
+    return _gauge(1.8, "Seconds", [0, 5], "#764ba2", [
+        (0, 1, "#f0f0f0"), (1, 2, "#e0e0e0"), (2, 3, "#d0d0d0"), (3, 5, "#c0c0c0"),
+    ])
+
+
+@st.cache_resource
+def gauge_success_rate() -> go.Figure:
+    return _gauge(99.8, "Percent", [0, 100], "#00C853", [
+        (0, 25, "#ffcccc"), (25, 50, "#ffe0cc"), (50, 75, "#ffffcc"), (75, 100, "#ccffcc"),
+    ])
+
+
+@st.cache_resource(max_entries=64)
+def volume_figure(volumes: tuple) -> go.Figure:
+    """Transactions per chain, keyed by the per-chain counts in NETWORKS order"""
+    fig = go.Figure(data=[
+        go.Bar(
+            x=CHAIN_NAMES,
+            y=list(volumes),
+            marker_color=CHAIN_COLORS
+        )
+    ])
+    fig.update_layout(
+        height=300,
+        margin=dict(l=0, r=0, t=0, b=0),
+        showlegend=False
+    )
+    return fig
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def block_production_series() -> tuple:
+    """Sample blocks-per-hour for the last 24 hours, stable for a minute"""
+    times = pd.date_range(end=datetime.now(), periods=24, freq='h')
+    return times, np.random.randint(1500, 2001, size=24)
+
+
+@st.cache_resource
+def comparison_frame() -> pd.DataFrame:
+    """Static columns of the network comparison table, in NETWORKS order"""
+    return pd.DataFrame([
+        {
+            'Network': network['name'],
+            'Type': network['type'],
+            'Consensus': network['consensus'],
+            'TPS': network['tps'],
+            'Block Time': f"{network['block_time']}s",
+            'Validators': network['validators'],
+            'Status': '🟢 Online' if network['status'] == 'online' else '🔴 Offline'
+        }
+        for network in NETWORKS.values()
+    ])
+
+
+@st.cache_resource
+def flow_figure() -> go.Figure:
+    """Transaction lifecycle diagram shown after a transaction is broadcast"""
+    # Nodes and their connecting line share coordinates: one trace
+    fig = go.Figure(go.Scatter(
+        x=[0, 2, 4, 6, 8],
+        y=[0, 0, 0, 0, 0],
+        mode='lines+markers+text',
+        marker=dict(size=50, color=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe']),
+        line=dict(color='gray', width=2),
+        text=['Create', 'Sign', 'Broadcast', 'Validate', 'Confirm'],
+        textposition='bottom center'
+    ))
+
+    fig.update_layout(
+        height=200,
+        showlegend=False,
+        xaxis=dict(showgrid=False, showticklabels=False),
+        yaxis=dict(showgrid=False, showticklabels=False, range=[-1, 1]),
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    return fig
+
+
+# Headless / CI runs: KAZ_FAST=1 disables every demo animation
+FAST_MODE = bool(os.getenv("KAZ_FAST"))
+
+MINING_WORKERS = os.cpu_count() or 1
+
+# Pending transactions are mined together once a chain's mempool holds the
+# batch size (tunable in the sidebar, MEMPOOL_BATCH_SIZE by default), or when
+# the oldest has waited MEMPOOL_MAX_AGE seconds
+MEMPOOL_BATCH_SIZE = 18
+MEMPOOL_BATCH_RANGE = (2, 50)
+MEMPOOL_MAX_AGE = 30
+
+BRIDGE_FEE_RATE = 0.003  # 0.3% of every token transfer
+GWEI_TO_ETH = 1e-9
+
+
+def bridge_quote(amount: float) -> Tuple[float, float]:
+    """(fee, amount received) for a token bridge transfer"""
+    fee = amount * BRIDGE_FEE_RATE
+    return fee, amount - fee
+
+
+@st.cache_resource
+def get_mining_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for proof-of-work, or None on a single core"""
+    if MINING_WORKERS < 2:
+        return None
+    # spawn, not fork: the Streamlit server process is multi-threaded
+    return ProcessPoolExecutor(max_workers=MINING_WORKERS,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+
 class KazSmartChain:
-    def __init__(self):
-        self.init_session_state()
-        self.init_blockchain_data()
+    networks = NETWORKS
+    # Display names resolved once, for format_func and labels
+    _chain_name = dict(zip(CHAIN_IDS, CHAIN_NAMES))
 
     def init_session_state(self):
         """Initialize session state variables"""
+        if st.session_state.setdefault('_kazchain_inited', False):
+            return
+
         if 'blocks' not in st.session_state:
             st.session_state.blocks = {
                 'besu': self.generate_genesis_block('besu'),
@@ -232,6 +491,23 @@ class KazSmartChain:
         if 'transactions' not in st.session_state:
             st.session_state.transactions = []
 
+        if 'tx_index' not in st.session_state:
+            st.session_state.tx_index = {}
+
+        if 'total_volume' not in st.session_state:
+            st.session_state.total_volume = 0
+
+        if 'tx_by_chain' not in st.session_state:
+            st.session_state.tx_by_chain = {chain: [] for chain in st.session_state.blocks}
+
+        if 'pow_difficulty' not in st.session_state:
+            st.session_state.pow_difficulty = {
+                chain: network['pow_nibbles'] for chain, network in self.networks.items()
+            }
+
+        if 'mempool' not in st.session_state:
+            st.session_state.mempool = {chain: [] for chain in st.session_state.blocks}
+
         if 'smart_contracts' not in st.session_state:
             st.session_state.smart_contracts = []
 
@@ -250,48 +526,15 @@ class KazSmartChain:
         if 'bridge_transfers' not in st.session_state:
             st.session_state.bridge_transfers = []
 
-    def init_blockchain_data(self):
-        """Initialize blockchain networks data"""
-        self.networks = {
-            'besu': {
-                'name': 'Hyperledger Besu',
-                'type': 'EVM-Compatible',
-                'consensus': 'IBFT 2.0',
-                'tps': 3500,
-                'block_time': 2,
-                'gas_price': 20,
-                'validators': 4,
-                'status': 'online',
-                'color': '#627EEA'
-            },
-            'fabric': {
-                'name': 'Hyperledger Fabric',
-                'type': 'Permissioned',
-                'consensus': 'Raft',
-                'tps': 3000,
-                'block_time': 1,
-                'gas_price': 0,
-                'validators': 3,
-                'status': 'online',
-                'color': '#00C853'
-            },
-            'corda': {
-                'name': 'Corda',
-                'type': 'Permissioned',
-                'consensus': 'Notary',
-                'tps': 1500,
-                'block_time': 3,
-                'gas_price': 0,
-                'validators': 2,
-                'status': 'online',
-                'color': '#E91E63'
-            }
-        }
+        if 'receipts' not in st.session_state:
+            st.session_state.receipts = {}
+
+        st.session_state._kazchain_inited = True
 
     def generate_wallet(self):
         """Generate a wallet address"""
         return {
-            'address': '0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:40],
+            'address': '0x' + secrets.token_hex(20),
             'balance': 1000000,
             'transactions': 0
         }
@@ -308,30 +551,100 @@ class KazSmartChain:
             miner="System"
         )]
 
-    def calculate_hash(self, data: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def calculate_hash(data: str) -> str:
         """Calculate SHA-256 hash"""
         return hashlib.sha256(data.encode()).hexdigest()
 
     def generate_ipfs_hash(self) -> str:
         """Generate mock IPFS hash"""
-        return 'Qm' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:44]
-
-    def mine_block(self, chain: str, transactions: List[Dict]) -> Block:
+        return 'Qm' + secrets.token_hex(22)
+
+    def find_nonce(self, header_prefix: bytes, difficulty: int,
+                   progress_cb: Optional[Callable[[int], None]] = None):
+        """Run the proof-of-work search on the fastest available backend"""
+        if mining_gpu.AVAILABLE:
+            try:
+                return mining_gpu.search(header_prefix, difficulty, progress_cb)
+            except mining_gpu.ERRORS:
+                # The device stopped working; use the CPU backends from now on
+                mining_gpu.AVAILABLE = False
+        if mining_jit.AVAILABLE:
+            return mining_jit.search(header_prefix, difficulty, progress_cb)
+
+        pool = get_mining_pool()
+        if pool is None:
+            return mining.mine(header_prefix, difficulty, progress_cb)
+        try:
+            return mining.mine_parallel(header_prefix, difficulty, pool, MINING_WORKERS, progress_cb)
+        except BrokenProcessPool:
+            # A dead worker poisons the pool for good; drop the cached one so
+            # the next block gets a fresh pool, and mine this one serially
+            get_mining_pool.clear()
+            pool.shutdown(wait=False, cancel_futures=True)
+            return mining.mine(header_prefix, difficulty, progress_cb)
+
+    def record_transaction(self, tx: Transaction):
+        """Append a transaction to the session history and its indexes"""
+        st.session_state.transactions.append(tx)
+        st.session_state.tx_index[tx.id] = tx
+        st.session_state.tx_by_chain[tx.blockchain].append(tx)
+        # Mock value per transaction, drawn once instead of on every render
+        st.session_state.total_volume += random.randint(1000, 10000)
+
+    def mempool_add(self, tx: Transaction):
+        """Record a transaction and queue it for the next block on its chain"""
+        self.record_transaction(tx)
+        st.session_state.mempool[tx.blockchain].append(tx.id)
+
+    def submit_transaction(self, tx: Transaction) -> Optional[Block]:
+        """Queue a transaction, mining its chain's mempool once it is full"""
+        self.mempool_add(tx)
+        if len(st.session_state.mempool[tx.blockchain]) >= self.mempool_batch_size():
+            return self.flush_mempool(tx.blockchain)
+        return None
+
+    def flush_mempool(self, chain: str,
+                      progress_cb: Optional[Callable[[str, int], None]] = None) -> Optional[Block]:
+        """Mine every pending transaction of a chain into one block"""
+        pending = st.session_state.mempool[chain]
+        if not pending:
+            return None
+
+        block = self.mine_block(chain, list(pending), progress_cb=progress_cb)
+        for tx_id in pending:
+            tx = st.session_state.tx_index[tx_id]
+            tx.status = 'Success'
+            tx.block_number = block.index
+        pending.clear()
+        return block
+
+    def mine_block(self, chain: str, transactions: List[str],
+                   progress_cb: Optional[Callable[[str, int], None]] = None) -> Block:
         """Mine a new block"""
+        report = progress_cb or (lambda message, percent: None)
         blocks = st.session_state.blocks[chain]
         previous_block = blocks[-1]
 
         index = len(blocks)
         timestamp = datetime.now().isoformat()
-        nonce = 0
 
-        # Simulate mining
-        while True:
-            block_data = f"{index}{timestamp}{transactions}{previous_block.hash}{nonce}"
-            hash_value = self.calculate_hash(block_data)
-            if hash_value[:4] == "0000":  # Simplified proof of work
-                break
-            nonce += 1
+        # Simplified proof of work: everything but the nonce is fixed
+        # Each extra hex zero multiplies the expected work by 16
+        difficulty = st.session_state.pow_difficulty[chain]
+        prefix = mining.block_header_prefix(index, timestamp, transactions, previous_block.hash)
+        report("Header hashed, searching for a valid nonce...", 10)
+
+        # A hit takes 16**difficulty nonces on average; the bar fills towards
+        # that and waits near the end if this block is unlucky
+        expected = 16 ** difficulty
+
+        def on_scanned(scanned: int):
+            report(f"Searched {scanned:,} nonces...", min(95, 10 + 85 * scanned // expected))
+
+        nonce, hash_value = self.find_nonce(prefix, difficulty, on_scanned)
+        report(f"Found nonce {nonce:,}", 100)
 
         new_block = Block(
             index=index,
@@ -348,7 +661,7 @@ class KazSmartChain:
 
     def deploy_smart_contract(self, name: str, code: str, chain: str) -> SmartContract:
         """Deploy a smart contract"""
-        contract_address = '0x' + hashlib.sha256(f"{name}{datetime.now()}".encode()).hexdigest()[:40]
+        contract_address = '0x' + _short_hex(f"{name}{datetime.now()}".encode(), 40)
 
         # Generate mock ABI
         abi = [
@@ -370,14 +683,14 @@ class KazSmartChain:
         ]
 
         # Generate mock bytecode
-        bytecode = '0x' + hashlib.sha256(code.encode()).hexdigest() * 10
+        bytecode = _deterministic_bytecode(code)
 
         contract = SmartContract(
             address=contract_address,
             name=name,
             blockchain=chain,
             abi=abi,
-            bytecode=bytecode[:100] + "...",
+            bytecode=bytecode + "...",
             deployed_at=datetime.now().isoformat(),
             transactions=0
         )
@@ -386,43 +699,49 @@ class KazSmartChain:
 
         # Create deployment transaction
         tx = Transaction(
-            id='0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:64],
+            id='0x' + secrets.token_hex(32),
             type='Contract Deployment',
             from_address=st.session_state.wallet['address'],
             to_address=contract_address,
             data={'contract': name, 'gas_limit': 3000000},
             timestamp=datetime.now().isoformat(),
             blockchain=chain,
-            status='Success',
+            status='Pending',
             gas_used=2100000,
             block_number=len(st.session_state.blocks[chain])
         )
 
-        st.session_state.transactions.append(tx)
-
-        # Mine block with transaction
-        self.mine_block(chain, [asdict(tx)])
+        # Queue deployment for the next block
+        self.submit_transaction(tx)
 
         return contract
 
-    def upload_file_to_blockchain(self, file, chain: str) -> FileRecord:
+    def upload_file_to_blockchain(self, file, chain: str,
+                                  progress_cb: Optional[Callable[[str, int], None]] = None) -> FileRecord:
         """Upload file to blockchain"""
-        # Calculate file hash
-        file_bytes = file.read()
-        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        report = progress_cb or (lambda message, percent: None)
+
+        # Calculate file hash, streaming chunks instead of copying the upload
+        report("Step 1/5: Calculating file hash...", 20)
+        file.seek(0)
+        file_hash = _file_sha256(file)
+        file.seek(0)
+        file_size = file.size
 
         # Generate IPFS hash (simulated)
+        report("Step 2/5: Uploading to IPFS...", 40)
         ipfs_hash = self.generate_ipfs_hash()
 
         # Create file record
+        report("Step 3/5: Interacting with smart contract...", 60)
         file_record = FileRecord(
-            file_id=str(uuid.uuid4()),
+            file_id=secrets.token_hex(16),
             name=file.name,
-            size=len(file_bytes),
+            size=file_size,
             hash=file_hash,
             ipfs_hash=ipfs_hash,
             blockchain=chain,
-            tx_hash='0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:64],
+            tx_hash='0x' + secrets.token_hex(32),
             timestamp=datetime.now().isoformat(),
             owner=st.session_state.wallet['address']
         )
@@ -430,6 +749,7 @@ class KazSmartChain:
         st.session_state.files.append(file_record)
 
         # Create transaction
+        report("Step 4/5: Creating blockchain transaction...", 80)
         tx = Transaction(
             id=file_record.tx_hash,
             type='File Upload',
@@ -439,26 +759,25 @@ class KazSmartChain:
                 'file_name': file.name,
                 'file_hash': file_hash,
                 'ipfs_hash': ipfs_hash,
-                'size': len(file_bytes)
+                'size': file_size
             },
             timestamp=datetime.now().isoformat(),
             blockchain=chain,
-            status='Success',
+            status='Pending',
             gas_used=50000,
             block_number=len(st.session_state.blocks[chain])
         )
 
-        st.session_state.transactions.append(tx)
-
-        # Mine block
-        self.mine_block(chain, [asdict(tx)])
+        # Queue for the next block
+        report("Step 5/5: Submitting to mempool...", 100)
+        self.submit_transaction(tx)
 
         return file_record
 
     def bridge_asset(self, asset_id: str, from_chain: str, to_chain: str, amount: float):
         """Bridge asset between chains"""
         bridge_tx = {
-            'id': str(uuid.uuid4()),
+            'id': secrets.token_hex(16),
             'asset': asset_id,
             'from_chain': from_chain,
             'to_chain': to_chain,
@@ -473,24 +792,53 @@ class KazSmartChain:
 
         # Create lock transaction on source chain
         lock_tx = Transaction(
-            id='0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:64],
+            id='0x' + secrets.token_hex(32),
             type='Bridge Lock',
             from_address=st.session_state.wallet['address'],
             to_address='0xBridge' + from_chain[:20],
             data={'asset': asset_id, 'amount': amount, 'destination': to_chain},
             timestamp=datetime.now().isoformat(),
             blockchain=from_chain,
-            status='Success',
+            status='Pending',
             gas_used=75000,
             block_number=len(st.session_state.blocks[from_chain])
         )
 
-        st.session_state.transactions.append(lock_tx)
-        self.mine_block(from_chain, [asdict(lock_tx)])
+        self.submit_transaction(lock_tx)
 
         # Simulate bridge processing
         return bridge_tx
 
+    def animations_enabled(self) -> bool:
+        """Demo animations are opt-in via the sidebar and always off under KAZ_FAST"""
+        return not FAST_MODE and st.session_state.get('demo_mode', False)
+
+    def mempool_batch_size(self) -> int:
+        """Transactions per block before a chain's mempool is mined automatically"""
+        return st.session_state.get('mempool_batch_size', MEMPOOL_BATCH_SIZE)
+
+    def finish_action(self, kind: str, **receipt):
+        """Keep an action's receipt and rerun the whole app.
+
+        The tabs are fragments, so without a full rerun the sidebar, the
+        explorer and the analytics would not see the new state. The receipt
+        lives in session state so it survives that rerun.
+        """
+        st.session_state.receipts[kind] = dict(receipt, fresh=True)
+        st.rerun(scope="app")
+
+    def receipt(self, kind: str) -> Optional[Dict[str, Any]]:
+        """Last receipt of an action kind; celebrates the first time it is shown"""
+        receipt = st.session_state.receipts.get(kind)
+        if receipt is not None and receipt.pop('fresh', False):
+            st.balloons()
+        return receipt
+
+    def demo_pause(self, seconds: float):
+        """Sleep only when animated demo steps are enabled"""
+        if self.animations_enabled():
+            time.sleep(seconds)
+
     def render_header(self):
         """Render application header"""
         col1, col2, col3 = st.columns([1, 3, 1])
@@ -510,6 +858,10 @@ class KazSmartChain:
             st.code(st.session_state.wallet['address'][:10] + "...", language=None)
             st.metric("Balance", f"₸{st.session_state.wallet['balance']:,}")
 
+    def select_chain(self, chain_id: str):
+        """Sidebar button callback"""
+        st.session_state.current_chain = chain_id
+
     def render_sidebar(self):
         """Render sidebar with blockchain selection"""
         with st.sidebar:
@@ -519,10 +871,10 @@ class KazSmartChain:
                 with st.container():
                     col1, col2 = st.columns([3, 1])
                     with col1:
-                        if st.button(network['name'], key=f"select_{chain_id}",
-                                     use_container_width=True):
-                            st.session_state.current_chain = chain_id
-                            st.rerun()
+                        # on_click runs before the rerun, so no second st.rerun() pass
+                        st.button(network['name'], key=f"select_{chain_id}",
+                                  use_container_width=True,
+                                  on_click=self.select_chain, args=(chain_id,))
                     with col2:
                         st.markdown(f"""
                         <span class='status-indicator status-online'></span>
@@ -533,6 +885,12 @@ class KazSmartChain:
                         st.metric("TPS", f"{network['tps']:,}")
                         st.metric("Block Time", f"{network['block_time']}s")
                         st.metric("Validators", network['validators'])
+                        st.session_state.pow_difficulty[chain_id] = st.slider(
+                            "PoW difficulty (leading hex zeros)", 1, 6,
+                            value=st.session_state.pow_difficulty[chain_id],
+                            key=f"pow_{chain_id}",
+                            help="Expected hashes per block grow 16x per step"
+                        )
 
             st.markdown("---")
 
@@ -540,9 +898,18 @@ class KazSmartChain:
             total_blocks = sum(len(blocks) for blocks in st.session_state.blocks.values())
             st.metric("Total Blocks", total_blocks)
             st.metric("Total Transactions", len(st.session_state.transactions))
+            st.metric("Pending Transactions", sum(len(p) for p in st.session_state.mempool.values()))
             st.metric("Smart Contracts", len(st.session_state.smart_contracts))
             st.metric("Files Stored", len(st.session_state.files))
 
+            st.markdown("---")
+            st.slider("Mempool batch size", *MEMPOOL_BATCH_RANGE, value=MEMPOOL_BATCH_SIZE,
+                      key="mempool_batch_size",
+                      help="Pending transactions per chain that trigger mining a block")
+            st.toggle("Animated demo steps", value=False, key="demo_mode",
+                      disabled=FAST_MODE,
+                      help="Pause between steps so each stage is visible")
+
     def render_main_content(self):
         """Render main content area"""
         tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
@@ -599,8 +966,7 @@ class KazSmartChain:
             """, unsafe_allow_html=True)
 
         with col3:
-            chain_txs = [tx for tx in st.session_state.transactions
-                         if tx.blockchain == current_chain]
+            chain_txs = st.session_state.tx_by_chain[current_chain]
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-value">{len(chain_txs)}</div>
@@ -625,31 +991,35 @@ class KazSmartChain:
                 with st.spinner("Mining block..."):
                     # Create sample transaction
                     sample_tx = Transaction(
-                        id='0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:64],
+                        id='0x' + secrets.token_hex(32),
                         type='Transfer',
                         from_address=st.session_state.wallet['address'],
-                        to_address='0x' + hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:40],
+                        to_address='0x' + secrets.token_hex(20),
                         data={'amount': random.randint(100, 10000), 'token': 'KZT'},
                         timestamp=datetime.now().isoformat(),
                         blockchain=current_chain,
-                        status='Success',
+                        status='Pending',
                         gas_used=21000,
                         block_number=len(blocks)
                     )
-                    st.session_state.transactions.append(sample_tx)
-
-                    # Mine the block
-                    new_block = self.mine_block(current_chain, [asdict(sample_tx)])
+                    self.mempool_add(sample_tx)
 
-                    # Show mining process
+                    # Mine it together with anything pending, showing real progress
                     progress_bar = st.progress(0)
-                    for i in range(100):
-                        time.sleep(0.01)
-                        progress_bar.progress(i + 1)
 
-                    st.success(f"✅ Block #{new_block.index} mined successfully!")
-                    st.balloons()
-                    st.rerun()
+                    def report(message, percent):
+                        progress_bar.progress(percent, text=message)
+
+                    new_block = self.flush_mempool(current_chain, progress_cb=report)
+                    self.demo_pause(0.5)
+                    self.finish_action('mine', block_index=new_block.index)
+
+            mined = self.receipt('mine')
+            if mined:
+                st.success(f"✅ Block #{mined['block_index']} mined successfully!")
+
+        with col2:
+            self.render_mempool()
 
         # Display blocks
         st.markdown("### Recent Blocks")
@@ -668,18 +1038,49 @@ class KazSmartChain:
                 with col2:
                     st.markdown("**Transactions**")
                     if block.transactions:
-                        for tx in block.transactions:
+                        for tx_id in block.transactions:
+                            tx = st.session_state.tx_index[tx_id]
                             st.markdown(f"""
                             <div class="transaction-card">
-                                <strong>Type:</strong> {tx.get('type', 'Unknown')}<br>
-                                <strong>From:</strong> {tx.get('from_address', '')[:10]}...<br>
-                                <strong>To:</strong> {tx.get('to_address', '')[:10]}...<br>
-                                <strong>Status:</strong> {tx.get('status', 'Unknown')}
+                                <strong>Type:</strong> {tx.type}<br>
+                                <strong>From:</strong> {tx.from_address[:10]}...<br>
+                                <strong>To:</strong> {tx.to_address[:10]}...<br>
+                                <strong>Status:</strong> {tx.status}
                             </div>
                             """, unsafe_allow_html=True)
                     else:
                         st.info("No transactions in this block")
 
+    @st.fragment(run_every=10)
+    def render_mempool(self):
+        """Pending transactions of every chain, auto-mined when stale"""
+        mempool = st.session_state.mempool
+
+        # Uploads and bridge locks queue on chains other than the one shown,
+        # so every chain's queue is checked, not only the current one.
+        # A timer-driven flush only refreshes this fragment: rerunning the
+        # app here would wipe whatever the user is reading in other tabs.
+        # The sidebar and block list catch up on the next interaction.
+        for chain, pending in mempool.items():
+            if not pending:
+                continue
+            oldest = datetime.fromisoformat(st.session_state.tx_index[pending[0]].timestamp)
+            if (datetime.now() - oldest).total_seconds() >= MEMPOOL_MAX_AGE:
+                self.flush_mempool(chain)
+
+        total = sum(len(pending) for pending in mempool.values())
+        if total and st.button(f"⛏️ Mine Pending ({total})", key="mine_pending"):
+            with st.spinner("Mining pending transactions..."):
+                for chain in mempool:
+                    self.flush_mempool(chain)
+            # Explicit request: refresh the block list and sidebar totals too
+            st.rerun(scope="app")
+
+        current = len(mempool[st.session_state.current_chain])
+        st.caption(f"Mempool: {current} pending on this chain, {total} in total"
+                   f" / batch of {self.mempool_batch_size()}")
+
+    @st.fragment
     def render_file_upload(self):
         """Render file upload to blockchain"""
         st.markdown("## 📄 File Upload to Blockchain")
@@ -719,16 +1120,16 @@ class KazSmartChain:
                 # Calculate hash preview
                 file_preview = uploaded_file.read(1024)  # Read first 1KB for preview
                 uploaded_file.seek(0)  # Reset file pointer
-                preview_hash = hashlib.sha256(file_preview).hexdigest()
-                st.code(f"Preview Hash: {preview_hash[:32]}...", language=None)
+                preview_hash = _short_hex(file_preview, 32)
+                st.code(f"Preview Hash: {preview_hash}...", language=None)
 
             with col2:
                 st.markdown("### Upload Settings")
 
                 selected_chain = st.selectbox(
                     "Select Blockchain",
-                    options=list(self.networks.keys()),
-                    format_func=lambda x: self.networks[x]['name']
+                    options=CHAIN_IDS,
+                    format_func=self._chain_name.__getitem__
                 )
 
                 encryption = st.checkbox("Encrypt file before upload", value=True)
@@ -740,86 +1141,60 @@ class KazSmartChain:
 
             if st.button("🚀 Upload to Blockchain", type="primary", use_container_width=True):
                 with st.spinner("Processing file upload..."):
-                    # Step 1: Hash calculation
                     progress_text = st.empty()
                     progress_bar = st.progress(0)
 
-                    progress_text.text("Step 1/5: Calculating file hash...")
-                    progress_bar.progress(20)
-                    time.sleep(0.5)
-
-                    # Step 2: IPFS upload
-                    progress_text.text("Step 2/5: Uploading to IPFS...")
-                    progress_bar.progress(40)
-                    time.sleep(0.5)
-
-                    # Step 3: Smart contract interaction
-                    progress_text.text("Step 3/5: Interacting with smart contract...")
-                    progress_bar.progress(60)
-                    time.sleep(0.5)
-
-                    # Step 4: Transaction creation
-                    progress_text.text("Step 4/5: Creating blockchain transaction...")
-                    progress_bar.progress(80)
-                    time.sleep(0.5)
+                    def report(message, percent):
+                        progress_text.text(message)
+                        progress_bar.progress(percent)
+                        self.demo_pause(0.5)
 
-                    # Step 5: Block mining
-                    progress_text.text("Step 5/5: Mining block...")
-                    progress_bar.progress(100)
-                    time.sleep(0.5)
-
-                    # Upload file
-                    file_record = self.upload_file_to_blockchain(uploaded_file, selected_chain)
+                    # Upload file, reporting each step as it happens
+                    file_record = self.upload_file_to_blockchain(uploaded_file, selected_chain,
+                                                                 progress_cb=report)
 
-                    progress_text.empty()
-                    progress_bar.empty()
+                    self.finish_action('upload', file_record=file_record)
 
-                    # Show success message
-                    st.success("✅ File successfully uploaded to blockchain!")
+        receipt = self.receipt('upload')
+        if receipt:
+            file_record = receipt['file_record']
 
-                    # Display file record
-                    st.markdown("### Upload Receipt")
+            # Show success message
+            st.success("✅ File successfully uploaded to blockchain!")
 
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.code(f"File ID: {file_record.file_id}", language=None)
-                        st.code(f"IPFS Hash: {file_record.ipfs_hash}", language=None)
-                        st.code(f"File Hash: {file_record.hash[:32]}...", language=None)
-
-                    with col2:
-                        st.code(f"Transaction: {file_record.tx_hash[:32]}...", language=None)
-                        st.code(f"Blockchain: {self.networks[file_record.blockchain]['name']}", language=None)
-                        st.code(f"Timestamp: {file_record.timestamp[:19]}", language=None)
+            # Display file record
+            st.markdown("### Upload Receipt")
 
-                    # Generate QR code for file access
-                    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-                    qr.add_data(f"ipfs://{file_record.ipfs_hash}")
-                    qr.make(fit=True)
-
-                    img = qr.make_image(fill_color="black", back_color="white")
-                    buf = BytesIO()
-                    img.save(buf, format='PNG')
+            col1, col2 = st.columns(2)
+            with col1:
+                st.code(f"File ID: {file_record.file_id}", language=None)
+                st.code(f"IPFS Hash: {file_record.ipfs_hash}", language=None)
+                st.code(f"File Hash: {file_record.hash[:32]}...", language=None)
 
-                    st.markdown("### Access QR Code")
-                    st.image(buf.getvalue(), width=200)
+            with col2:
+                st.code(f"Transaction: {file_record.tx_hash[:32]}...", language=None)
+                st.code(f"Blockchain: {self._chain_name[file_record.blockchain]}", language=None)
+                st.code(f"Timestamp: {file_record.timestamp[:19]}", language=None)
 
-                    st.balloons()
+            # QR code for file access
+            st.markdown("### Access QR Code")
+            st.image(qr_png(f"ipfs://{file_record.ipfs_hash}"), width=200)
 
         # Display uploaded files
         if st.session_state.files:
             st.markdown("---")
             st.markdown("### Previously Uploaded Files")
 
-            df = pd.DataFrame([asdict(f) for f in st.session_state.files])
-            df['size'] = df['size'].apply(lambda x: f"{x:,} bytes")
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
+            files = st.session_state.files
+            df = files_frame((len(files), files[-1].file_id), files)
 
             st.dataframe(
-                df[['name', 'size', 'blockchain', 'timestamp', 'ipfs_hash']],
+                df,
                 use_container_width=True,
                 hide_index=True
             )
 
+    @st.fragment
     def render_smart_contracts(self):
         """Render smart contract deployment"""
         st.markdown("## 📝 Smart Contract Deployment")
@@ -844,76 +1219,7 @@ class KazSmartChain:
                 ["ERC-20 Token", "ERC-721 NFT", "Marketplace", "Bridge", "Custom"]
             )
 
-            # Default contract code based on template
-            if template == "ERC-20 Token":
-                default_code = """// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract KazToken {
-    string public name = "KazToken";
-    string public symbol = "KZT";
-    uint8 public decimals = 18;
-    uint256 public totalSupply = 1000000 * 10**18;
-
-    mapping(address => uint256) public balanceOf;
-    mapping(address => mapping(address => uint256)) public allowance;
-
-    event Transfer(address indexed from, address indexed to, uint256 value);
-    event Approval(address indexed owner, address indexed spender, uint256 value);
-
-    constructor() {
-        balanceOf[msg.sender] = totalSupply;
-    }
-
-    function transfer(address to, uint256 amount) public returns (bool) {
-        require(balanceOf[msg.sender] >= amount, "Insufficient balance");
-        balanceOf[msg.sender] -= amount;
-        balanceOf[to] += amount;
-        emit Transfer(msg.sender, to, amount);
-        return true;
-    }
-}"""
-            elif template == "ERC-721 NFT":
-                default_code = """// SPDX-License-Identifier: MIT
-pragma solidity ^0.8.0;
-
-contract KazNFT {
-    string public name = "Kazakhstan Digital Art";
-    string public symbol = "KAZART";
-    uint256 private _tokenIds;
-
-    mapping(uint256 => address) private _owners;
-    mapping(address => uint256) private _balances;
-    mapping(uint256 => string) private _tokenURIs;
-
-    event Transfer(address indexed from, address indexed to, uint256 indexed tokenId);
-    event Mint(address indexed to, uint256 indexed tokenId, string tokenURI);
-
-    function mint(address to, string memory tokenURI) public returns (uint256) {
-        _tokenIds++;
-        uint256 newTokenId = _tokenIds;
-
-        _owners[newTokenId] = to;
-        _balances[to]++;
-        _tokenURIs[newTokenId] = tokenURI;
-
-        emit Transfer(address(0), to, newTokenId);
-        emit Mint(to, newTokenId, tokenURI);
-
-        return newTokenId;
-    }
-
-    function ownerOf(uint256 tokenId) public view returns (address) {
-        return _owners[tokenId];
-    }
-}"""
-            else:
-                default_code = """// Your smart contract code here
-pragma solidity ^0.8.0;
-
-contract MyContract {
-    // Contract implementation
-}"""
+            default_code = TEMPLATES.get(template, TEMPLATES["default"])
 
             contract_code = st.text_area(
                 "Contract Code",
@@ -930,14 +1236,18 @@ contract MyContract {
             deploy_chain = st.selectbox(
                 "Target Blockchain",
                 options=['besu'],  # Only Besu supports EVM contracts
-                format_func=lambda x: self.networks[x]['name']
+                format_func=self._chain_name.__getitem__
             )
 
             st.markdown("### Gas Settings")
             gas_limit = st.number_input("Gas Limit", value=3000000, min_value=21000)
             gas_price = st.slider("Gas Price (Gwei)", 1, 100, 20)
+            optimize_runs = st.number_input(
+                "Optimizer Runs", value=200, min_value=1, max_value=2**31 - 1,
+                help="Higher values favour cheaper calls over smaller deployment bytecode"
+            )
 
-            estimated_cost = (gas_limit * gas_price) / 1e9
+            estimated_cost = gas_limit * gas_price * GWEI_TO_ETH
             st.info(f"Estimated Cost: {estimated_cost:.6f} ETH")
 
             st.markdown("### Security Audit")
@@ -950,19 +1260,25 @@ contract MyContract {
         with col1:
             if st.button("🔨 Compile Contract", use_container_width=True):
                 with st.spinner("Compiling contract..."):
-                    time.sleep(1)
-                    st.success("✅ Contract compiled successfully!")
+                    if not solc_available():
+                        self.demo_pause(1)
+                    compiled = compile_contract(contract_code, int(optimize_runs))
+                    if 'error' in compiled:
+                        st.error("❌ Compilation failed")
+                        st.code(compiled['error'], language=None)
+                    else:
+                        st.success("✅ Contract compiled successfully!")
 
-                    # Show compilation output
-                    st.markdown("### Compilation Output")
-                    st.code(f"Bytecode size: {len(contract_code) * 2} bytes", language=None)
-                    st.code(f"Optimization: Enabled", language=None)
-                    st.code(f"Compiler: Solidity 0.8.19", language=None)
+                        # Show compilation output
+                        st.markdown("### Compilation Output")
+                        st.code(f"Bytecode size: {compiled['bytecode_size']:,} bytes", language=None)
+                        st.code(f"Optimization: Enabled ({compiled['optimize_runs']} runs)", language=None)
+                        st.code(f"Compiler: {compiled['compiler']}", language=None)
 
         with col2:
             if st.button("🧪 Test Contract", use_container_width=True):
                 with st.spinner("Running tests..."):
-                    time.sleep(1)
+                    self.demo_pause(1)
                     st.success("✅ All tests passed!")
 
                     # Show test results
@@ -974,68 +1290,87 @@ contract MyContract {
         with col3:
             if st.button("🚀 Deploy Contract", type="primary", use_container_width=True):
                 with st.spinner("Deploying contract..."):
-                    # Deployment process visualization
-                    progress_text = st.empty()
-                    progress_bar = st.progress(0)
-
-                    steps = [
-                        "Compiling contract...",
-                        "Generating bytecode...",
-                        "Creating deployment transaction...",
-                        "Broadcasting to network...",
-                        "Waiting for confirmation...",
-                        "Verifying contract..."
-                    ]
-
-                    for i, step in enumerate(steps):
-                        progress_text.text(f"Step {i + 1}/{len(steps)}: {step}")
-                        progress_bar.progress((i + 1) / len(steps))
-                        time.sleep(0.5)
+                    # Deployment process visualization; the intermediate
+                    # steps are only sent to the browser when animated
+                    if self.animations_enabled():
+                        progress_bar = st.progress(0)
+
+                        steps = [
+                            "Compiling contract...",
+                            "Generating bytecode...",
+                            "Creating deployment transaction...",
+                            "Broadcasting to network...",
+                            "Waiting for confirmation...",
+                            "Verifying contract..."
+                        ]
+
+                        for i, step in enumerate(steps):
+                            progress_bar.progress((i + 1) / len(steps),
+                                                  text=f"Step {i + 1}/{len(steps)}: {step}")
+                            time.sleep(0.5)
+
+                        progress_bar.empty()
 
                     # Deploy contract
                     contract = self.deploy_smart_contract(contract_name, contract_code, deploy_chain)
+                    self.finish_action('deploy', contract=contract,
+                                       tx_id=st.session_state.transactions[-1].id)
 
-                    progress_text.empty()
-                    progress_bar.empty()
+            receipt = self.receipt('deploy')
+            if receipt:
+                contract = receipt['contract']
+                deploy_tx = st.session_state.tx_index[receipt['tx_id']]
 
-                    st.success(f"✅ Contract deployed successfully!")
+                st.success(f"✅ Contract deployed successfully!")
 
-                    # Show deployment details
-                    st.markdown("### Deployment Details")
+                # Show deployment details
+                st.markdown("### Deployment Details")
 
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.code(f"Contract Address:\n{contract.address}", language=None)
-                        st.code(f"Transaction Hash:\n{st.session_state.transactions[-1].id[:32]}...", language=None)
-
-                    with col2:
-                        st.code(f"Block Number: {len(st.session_state.blocks[deploy_chain]) - 1}", language=None)
-                        st.code(f"Gas Used: {st.session_state.transactions[-1].gas_used:,}", language=None)
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.code(f"Contract Address:\n{contract.address}", language=None)
+                    st.code(f"Transaction Hash:\n{deploy_tx.id[:32]}...", language=None)
 
-                    st.balloons()
+                with col2:
+                    pending = " (pending)" if deploy_tx.status == 'Pending' else ""
+                    st.code(f"Block Number: {deploy_tx.block_number}{pending}", language=None)
+                    st.code(f"Gas Used: {deploy_tx.gas_used:,}", language=None)
 
         # Display deployed contracts
         if st.session_state.smart_contracts:
             st.markdown("---")
             st.markdown("### Deployed Contracts")
 
-            for contract in st.session_state.smart_contracts[-3:]:
-                with st.expander(f"{contract.name} - {contract.address[:10]}..."):
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        st.markdown("**Contract Info**")
-                        st.text(f"Blockchain: {self.networks[contract.blockchain]['name']}")
-                        st.text(f"Deployed: {contract.deployed_at[:19]}")
-                        st.text(f"Transactions: {contract.transactions}")
+            recent = st.session_state.smart_contracts[-3:]
+            st.dataframe(pd.DataFrame({
+                'Name': [c.name for c in recent],
+                'Address': [c.address[:10] + "..." for c in recent],
+                'Chain': [self._chain_name[c.blockchain] for c in recent],
+                'Deployed': [c.deployed_at[:19] for c in recent],
+                'Txs': [c.transactions for c in recent],
+            }), hide_index=True, use_container_width=True)
+
+            # One action area for the selected contract instead of buttons per row
+            by_address = {c.address: c for c in recent}
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                selected = st.selectbox(
+                    "Contract",
+                    list(reversed(by_address)),
+                    format_func=lambda a: f"{by_address[a].name} - {a[:10]}...",
+                    key="contract_select"
+                )
+            with col2:
+                show_abi = st.button("View ABI", key="contract_abi")
+            with col3:
+                interact = st.button("Interact", key="contract_interact")
 
-                    with col2:
-                        st.markdown("**Actions**")
-                        if st.button(f"View ABI", key=f"abi_{contract.address}"):
-                            st.json(contract.abi)
-                        if st.button(f"Interact", key=f"interact_{contract.address}"):
-                            st.info("Contract interaction interface would open here")
+            if show_abi:
+                st.json(by_address[selected].abi)
+            if interact:
+                st.info("Contract interaction interface would open here")
 
+    @st.fragment
     def render_bridge(self):
         """Render cross-chain bridge"""
         st.markdown("## 🌉 Cross-Chain Bridge")
@@ -1056,8 +1391,8 @@ contract MyContract {
             st.markdown("### Source Chain")
             source_chain = st.selectbox(
                 "From",
-                options=list(self.networks.keys()),
-                format_func=lambda x: self.networks[x]['name'],
+                options=CHAIN_IDS,
+                format_func=self._chain_name.__getitem__,
                 key="source_chain"
             )
 
@@ -1080,20 +1415,18 @@ contract MyContract {
             st.markdown("### Destination Chain")
             dest_chain = st.selectbox(
                 "To",
-                options=[c for c in self.networks.keys() if c != source_chain],
-                format_func=lambda x: self.networks[x]['name'],
+                options=[c for c in CHAIN_IDS if c != source_chain],
+                format_func=self._chain_name.__getitem__,
                 key="dest_chain"
             )
 
             st.markdown("### You will receive")
             if asset_type == "Token":
-                # Calculate bridge fee
-                bridge_fee = amount * 0.003  # 0.3% fee
-                receive_amount = amount - bridge_fee
+                bridge_fee, receive_amount = bridge_quote(amount)
                 st.info(f"{receive_amount:.2f} {token}")
                 st.text(f"Bridge fee: {bridge_fee:.2f} {token}")
             else:
-                st.info(f"Same asset on {self.networks[dest_chain]['name']}")
+                st.info(f"Same asset on {self._chain_name[dest_chain]}")
 
         # Bridge details
         st.markdown("---")
@@ -1118,66 +1451,69 @@ contract MyContract {
 
                 bridge_tx = self.bridge_asset(asset_id, source_chain, dest_chain, amount)
 
-                # Show progress
-                progress_bar = st.progress(0)
-                status_text = st.empty()
+                # Show progress; without animations only the final state is sent
+                if self.animations_enabled():
+                    status = st.empty()
+                    steps = [
+                        ("Locking assets on source chain...", 20),
+                        ("Generating cryptographic proof...", 40),
+                        ("Submitting to validators...", 60),
+                        ("Waiting for confirmations...", 80),
+                        ("Releasing on destination chain...", 100)
+                    ]
 
-                steps = [
-                    ("Locking assets on source chain...", 20),
-                    ("Generating cryptographic proof...", 40),
-                    ("Submitting to validators...", 60),
-                    ("Waiting for confirmations...", 80),
-                    ("Releasing on destination chain...", 100)
-                ]
+                    for step, progress in steps:
+                        status.progress(progress, text=step)
+                        time.sleep(0.8)
 
-                for step, progress in steps:
-                    status_text.text(step)
-                    progress_bar.progress(progress)
-                    time.sleep(0.8)
+                self.finish_action('bridge', bridge_tx=bridge_tx)
 
-                status_text.text("✅ Bridge transfer completed!")
-                progress_bar.empty()
+        receipt = self.receipt('bridge')
+        if receipt:
+            bridge_tx = receipt['bridge_tx']
+            st.text("✅ Bridge transfer completed!")
 
-                # Show transfer details
-                st.success("✅ Cross-chain transfer initiated successfully!")
+            # Show transfer details
+            st.success("✅ Cross-chain transfer initiated successfully!")
 
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("### Transfer Details")
-                    st.code(f"Bridge ID: {bridge_tx['id'][:8]}...", language=None)
-                    st.code(f"Status: {bridge_tx['status']}", language=None)
-
-                with col2:
-                    st.markdown("### Confirmations")
-                    st.progress(bridge_tx['confirmations'] / bridge_tx['required_confirmations'])
-                    st.text(f"{bridge_tx['confirmations']}/{bridge_tx['required_confirmations']} confirmations")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("### Transfer Details")
+                st.code(f"Bridge ID: {bridge_tx['id'][:8]}...", language=None)
+                st.code(f"Status: {bridge_tx['status']}", language=None)
 
-                st.balloons()
+            with col2:
+                st.markdown("### Confirmations")
+                st.progress(bridge_tx['confirmations'] / bridge_tx['required_confirmations'])
+                st.text(f"{bridge_tx['confirmations']}/{bridge_tx['required_confirmations']} confirmations")
 
         # Active bridges
         if st.session_state.bridge_transfers:
             st.markdown("---")
             st.markdown("### Active Bridge Transfers")
 
-            for transfer in st.session_state.bridge_transfers[-3:]:
-                with st.container():
-                    col1, col2, col3, col4 = st.columns(4)
-
-                    with col1:
-                        st.text(f"ID: {transfer['id'][:8]}...")
-                    with col2:
-                        st.text(
-                            f"{self.networks[transfer['from_chain']]['name'][:10]} → {self.networks[transfer['to_chain']]['name'][:10]}")
-                    with col3:
-                        confirmations = min(transfer['confirmations'] + random.randint(1, 3),
-                                            transfer['required_confirmations'])
-                        st.progress(confirmations / transfer['required_confirmations'])
-                    with col4:
-                        if confirmations >= transfer['required_confirmations']:
-                            st.success("Completed")
-                        else:
-                            st.warning("Processing")
+            recent = st.session_state.bridge_transfers[-3:]
+            required = np.array([t['required_confirmations'] for t in recent])
+            confirmations = np.minimum(
+                np.array([t['confirmations'] for t in recent]) + np.random.randint(1, 4, size=len(recent)),
+                required
+            )
+            st.dataframe(
+                pd.DataFrame({
+                    'ID': [t['id'][:8] + "..." for t in recent],
+                    'Route': [f"{self._chain_name[t['from_chain']][:10]} → {self._chain_name[t['to_chain']][:10]}"
+                              for t in recent],
+                    'Progress': confirmations / required,
+                    'Status': np.where(confirmations >= required, "Completed", "Processing"),
+                }),
+                column_config={
+                    'Progress': st.column_config.ProgressColumn(min_value=0, max_value=1),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
 
+    @st.fragment
     def render_transaction_flow(self):
         """Render transaction flow visualization"""
         st.markdown("## ⚙️ Transaction Flow Visualization")
@@ -1194,36 +1530,20 @@ contract MyContract {
                 # Transaction creation
                 st.markdown("### 1️⃣ Transaction Creation")
 
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("""
-                    <div class="process-step">
-                        <h4>Transaction Data</h4>
-                        <p>From: 0x742d35Cc...7595f0bEb7</p>
-                        <p>To: 0x5aAeb6...642138b79</p>
-                        <p>Amount: 100 KZT</p>
-                        <p>Gas: 21000</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                with col2:
-                    st.markdown("""
-                    <div class="process-step">
-                        <h4>Digital Signature</h4>
-                        <p>Private key signs transaction</p>
-                        <p>Signature: 0x3f4e8b2a...</p>
-                        <p>Verified by network</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown(_TX_CREATION_HTML, unsafe_allow_html=True)
 
-                time.sleep(0.5)
+                self.demo_pause(0.5)
 
                 # Broadcast
                 st.markdown("### 2️⃣ Network Broadcast")
                 progress_bar = st.progress(0)
-                for i in range(100):
-                    progress_bar.progress(i + 1)
-                    time.sleep(0.01)
+                if self.animations_enabled():
+                    # Ten frames of 10% rather than a message per percent
+                    for percent in range(10, 101, 10):
+                        progress_bar.progress(percent)
+                        time.sleep(0.1)
+                else:
+                    progress_bar.progress(100)
 
                 st.info("📡 Transaction broadcast to all network nodes")
 
@@ -1235,14 +1555,14 @@ contract MyContract {
 
                 for i, (col, validator) in enumerate(zip(cols, validators)):
                     with col:
-                        time.sleep(0.3)
+                        self.demo_pause(0.3)
                         st.success(f"✅ {validator}")
 
                 # Mining
                 st.markdown("### 4️⃣ Block Mining")
 
                 with st.spinner("Mining block..."):
-                    time.sleep(1)
+                    self.demo_pause(1)
 
                 st.code("""
 Block #1234
@@ -1260,36 +1580,7 @@ Block #1234
                 # Generate flow diagram
                 st.markdown("### Transaction Flow Diagram")
 
-                fig = go.Figure()
-
-                # Add nodes
-                fig.add_trace(go.Scatter(
-                    x=[0, 2, 4, 6, 8],
-                    y=[0, 0, 0, 0, 0],
-                    mode='markers+text',
-                    marker=dict(size=50, color=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe']),
-                    text=['Create', 'Sign', 'Broadcast', 'Validate', 'Confirm'],
-                    textposition='bottom center'
-                ))
-
-                # Add connections
-                fig.add_trace(go.Scatter(
-                    x=[0, 2, 4, 6, 8],
-                    y=[0, 0, 0, 0, 0],
-                    mode='lines',
-                    line=dict(color='gray', width=2),
-                    showlegend=False
-                ))
-
-                fig.update_layout(
-                    height=200,
-                    showlegend=False,
-                    xaxis=dict(showgrid=False, showticklabels=False),
-                    yaxis=dict(showgrid=False, showticklabels=False, range=[-1, 1]),
-                    margin=dict(l=0, r=0, t=0, b=0)
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(flow_figure(), use_container_width=True)
 
         # Recent transactions
         st.markdown("---")
@@ -1323,7 +1614,7 @@ Block #1234
         # Metrics
         col1, col2, col3, col4 = st.columns(4)
 
-        total_volume = sum(random.randint(1000, 10000) for _ in range(len(st.session_state.transactions)))
+        total_volume = st.session_state.total_volume
 
         with col1:
             st.metric("Total Volume", f"₸{total_volume:,}", "↑ 12.5%")
@@ -1340,33 +1631,16 @@ Block #1234
         with col1:
             st.markdown("### Transaction Volume by Chain")
 
-            # Generate data
-            chains = list(self.networks.keys())
-            volumes = [len([tx for tx in st.session_state.transactions if tx.blockchain == chain])
-                       for chain in chains]
-
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=[self.networks[c]['name'] for c in chains],
-                    y=volumes,
-                    marker_color=[self.networks[c]['color'] for c in chains]
-                )
-            ])
-
-            fig.update_layout(
-                height=300,
-                margin=dict(l=0, r=0, t=0, b=0),
-                showlegend=False
-            )
+            # One len() per chain from the per-chain index, no transaction scan
+            volumes = tuple(len(st.session_state.tx_by_chain[chain]) for chain in CHAIN_IDS)
 
+            fig = volume_figure(volumes)
             st.plotly_chart(fig, use_container_width=True)
 
         with col2:
             st.markdown("### Block Production Rate")
 
-            # Generate time series data
-            times = pd.date_range(end=datetime.now(), periods=24, freq='H')
-            blocks_per_hour = [random.randint(1500, 2000) for _ in range(24)]
+            times, blocks_per_hour = block_production_series()
 
             fig = go.Figure()
             fig.add_trace(go.Scatter(
@@ -1389,20 +1663,12 @@ Block #1234
         # Network comparison
         st.markdown("### Network Comparison")
 
-        comparison_data = []
-        for chain_id, network in self.networks.items():
-            comparison_data.append({
-                'Network': network['name'],
-                'Type': network['type'],
-                'Consensus': network['consensus'],
-                'TPS': network['tps'],
-                'Block Time': f"{network['block_time']}s",
-                'Validators': network['validators'],
-                'Blocks': len(st.session_state.blocks[chain_id]),
-                'Status': '🟢 Online' if network['status'] == 'online' else '🔴 Offline'
-            })
-
-        df = pd.DataFrame(comparison_data)
+        # Static columns are shared; only the live block counts are filled in
+        df = comparison_frame().copy()
+        df.insert(df.columns.get_loc('Status'), 'Blocks', np.fromiter(
+            (len(st.session_state.blocks[chain_id]) for chain_id in CHAIN_IDS),
+            dtype=np.int64, count=len(CHAIN_IDS)
+        ))
         st.dataframe(df, use_container_width=True, hide_index=True)
 
         # Performance metrics
@@ -1412,63 +1678,19 @@ Block #1234
 
         with col1:
             st.markdown("#### Throughput")
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=7500,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "TPS"},
-                gauge={'axis': {'range': [None, 10000]},
-                       'bar': {'color': "#667eea"},
-                       'steps': [
-                           {'range': [0, 2500], 'color': "#f0f0f0"},
-                           {'range': [2500, 5000], 'color': "#e0e0e0"},
-                           {'range': [5000, 7500], 'color': "#d0d0d0"},
-                           {'range': [7500, 10000], 'color': "#c0c0c0"}
-                       ]}
-            ))
-            fig.update_layout(height=200, margin=dict(l=0, r=0, t=0, b=0))
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(gauge_tps(), use_container_width=True)
 
         with col2:
             st.markdown("#### Latency")
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=1.8,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Seconds"},
-                gauge={'axis': {'range': [0, 5]},
-                       'bar': {'color': "#764ba2"},
-                       'steps': [
-                           {'range': [0, 1], 'color': "#f0f0f0"},
-                           {'range': [1, 2], 'color': "#e0e0e0"},
-                           {'range': [2, 3], 'color': "#d0d0d0"},
-                           {'range': [3, 5], 'color': "#c0c0c0"}
-                       ]}
-            ))
-            fig.update_layout(height=200, margin=dict(l=0, r=0, t=0, b=0))
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(gauge_latency(), use_container_width=True)
 
         with col3:
             st.markdown("#### Success Rate")
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=99.8,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Percent"},
-                gauge={'axis': {'range': [0, 100]},
-                       'bar': {'color': "#00C853"},
-                       'steps': [
-                           {'range': [0, 25], 'color': "#ffcccc"},
-                           {'range': [25, 50], 'color': "#ffe0cc"},
-                           {'range': [50, 75], 'color': "#ffffcc"},
-                           {'range': [75, 100], 'color': "#ccffcc"}
-                       ]}
-            ))
-            fig.update_layout(height=200, margin=dict(l=0, r=0, t=0, b=0))
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(gauge_success_rate(), use_container_width=True)
 
     def run(self):
         """Main application entry point"""
+        self.init_session_state()
         self.render_header()
         self.render_sidebar()
         self.render_main_content()
@@ -0,0 +1,123 @@
+"""
+KazSmartChain - Proof-of-work miner
+Nonce search used by KazSmartChain.mine_block, kept outside the Streamlit
+script so it can be imported without rendering the page (and by worker
+processes of the mining pool).
+"""
+
+import hashlib
+import json
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from itertools import count
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; json gives the same compact output
+    orjson = None
+
+# Nonces scanned per work unit; large enough to amortize the round trip
+# to a worker process, small enough that a stale chunk finishes quickly.
+MINING_CHUNK = 1 << 16
+
+
+def block_header_prefix(index: int, timestamp: str, transactions: List[str],
+                        previous_hash: str) -> bytes:
+    """Serialize the nonce-independent part of a block header once.
+
+    Transactions are encoded as compact JSON rather than their Python repr
+    (with orjson when installed); the miners append only the decimal nonce
+    to these bytes.
+    """
+    if orjson is not None:
+        tx_json = orjson.dumps(transactions)
+    else:
+        tx_json = json.dumps(transactions, separators=(",", ":")).encode()
+    return b"%d%s%s%s" % (index, timestamp.encode(), tx_json, previous_hash.encode())
+
+
+def mine(header_prefix: bytes, difficulty_nibbles: int,
+         progress_cb: Optional[Callable[[int], None]] = None) -> Tuple[int, str]:
+    """Find the first nonce whose SHA-256 hex digest starts with zeros.
+
+    The header prefix is everything in the block header except the nonce.
+    hashlib is backed by OpenSSL, which compresses with the CPU's SHA
+    extensions (SHA-NI / ARMv8 SHA2) where available. ``progress_cb`` is
+    called with the number of nonces scanned after each chunk without a hit.
+    """
+    threshold = difficulty_threshold(difficulty_nibbles)
+
+    for start in count(0, MINING_CHUNK):
+        result = _mine_range(header_prefix, start, start + MINING_CHUNK, threshold)
+        if result is not None:
+            return result
+        if progress_cb is not None:
+            progress_cb(start + MINING_CHUNK)
+
+
+def mine_parallel(header_prefix: bytes, difficulty_nibbles: int,
+                  executor: Executor, workers: int,
+                  progress_cb: Optional[Callable[[int], None]] = None) -> Tuple[int, str]:
+    """Shard the nonce search across a process pool.
+
+    Each worker scans a disjoint chunk of nonces; ``workers`` chunks are
+    kept in flight and the first hit wins. Queued chunks are cancelled,
+    chunks already running finish their (bounded) range and are ignored.
+    ``progress_cb`` gets the number of nonces scanned as chunks come back.
+    """
+    threshold = difficulty_threshold(difficulty_nibbles)
+    starts = count(0, MINING_CHUNK)
+    scanned = 0
+    pending = {
+        executor.submit(_mine_range, header_prefix, start, start + MINING_CHUNK, threshold)
+        for start in (next(starts) for _ in range(workers))
+    }
+
+    try:
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    return result
+
+                scanned += MINING_CHUNK
+                if progress_cb is not None:
+                    progress_cb(scanned)
+                start = next(starts)
+                pending.add(executor.submit(
+                    _mine_range, header_prefix, start, start + MINING_CHUNK, threshold))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def difficulty_threshold(difficulty_nibbles: int) -> bytes:
+    """Smallest 32-byte digest that fails the difficulty target.
+
+    A digest has ``difficulty_nibbles`` leading zero hex digits exactly
+    when it compares below this value, so the check is a single memcmp
+    instead of hex-encoding the digest and slicing it.
+    """
+    if difficulty_nibbles <= 0:
+        return b"\xff" * 33
+    return (1 << (256 - 4 * difficulty_nibbles)).to_bytes(32, "big")
+
+
+def _mine_range(header_prefix: bytes, start: int, stop: int,
+                threshold: bytes) -> Optional[Tuple[int, str]]:
+    """Scan nonces in [start, stop) and return the first (nonce, hash) hit.
+
+    The prefix is absorbed once into a midstate; each trial copies that
+    state and only feeds the nonce digits, so the prefix blocks are never
+    recompressed.
+    """
+    copy_base = hashlib.sha256(header_prefix).copy
+
+    for nonce in range(start, stop):
+        h = copy_base()
+        h.update(b"%d" % nonce)
+        if h.digest() < threshold:
+            return nonce, h.hexdigest()
+
+    return None
@@ -0,0 +1,89 @@
+"""
+KazSmartChain - CUDA proof-of-work backend
+Optional GPU nonce search (pip install cupy). The midstate of the header
+prefix is computed on the host; only the 32-byte state, the prefix tail and
+an 8-byte result slot cross to the device. Kernel source: sha256_mine.cu.
+"""
+
+import functools
+import hashlib
+import os
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+import mining_jit
+
+try:
+    import cupy as cp
+except ImportError:  # cupy is optional; CPU backends are the fallback
+    cp = None
+
+KERNEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sha256_mine.cu")
+
+THREADS_PER_BLOCK = 256
+BLOCKS_PER_LAUNCH = 4096
+
+_NO_HIT = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+@functools.lru_cache(maxsize=None)
+def _kernel():
+    with open(KERNEL_PATH) as f:
+        return cp.RawKernel(f.read(), "mine")
+
+
+def _device_available() -> bool:
+    """A device is present and the kernel builds on it (NVRTC included)"""
+    if cp is None:
+        return False
+    try:
+        if cp.cuda.runtime.getDeviceCount() == 0:
+            return False
+        _kernel().compile()
+    except Exception:  # no driver, missing/broken NVRTC, kernel does not build
+        return False
+    return True
+
+
+AVAILABLE = _device_available()
+
+# What a launch can raise on a working probe (device lost, out of memory);
+# callers catch these and fall back to the CPU backends
+if cp is not None:
+    ERRORS = (RuntimeError, MemoryError, cp.cuda.compiler.CompileException)
+else:
+    ERRORS = ()
+
+
+def search(header_prefix: bytes, difficulty_nibbles: int,
+           progress_cb: Optional[Callable[[int], None]] = None) -> Tuple[int, str]:
+    """Find the smallest nonce meeting the target on the GPU.
+
+    ``progress_cb`` is called with the number of nonces scanned after each
+    launch without a hit.
+    """
+    state, tail = mining_jit.midstate(header_prefix)
+    state_d = cp.asarray(state.astype(np.uint32))
+    # keep at least one byte so the kernel always gets a valid pointer
+    tail_d = cp.zeros(max(len(tail), 1), dtype=cp.uint8)
+    tail_d[:len(tail)] = cp.asarray(tail.astype(np.uint8))
+    out_d = cp.full(1, _NO_HIT, dtype=cp.uint64)
+
+    kernel = _kernel()
+    per_launch = BLOCKS_PER_LAUNCH * THREADS_PER_BLOCK
+    base_nonce = 0
+
+    while True:
+        kernel(
+            (BLOCKS_PER_LAUNCH,), (THREADS_PER_BLOCK,),
+            (state_d, tail_d, np.uint32(len(tail)), np.uint64(len(header_prefix)),
+             np.uint64(base_nonce), np.uint32(difficulty_nibbles), out_d)
+        )
+        nonce = out_d.get()[0]
+        if nonce != _NO_HIT:
+            nonce = int(nonce)
+            return nonce, hashlib.sha256(header_prefix + b"%d" % nonce).hexdigest()
+        base_nonce += per_launch
+        if progress_cb is not None:
+            progress_cb(base_nonce)
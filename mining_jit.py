@@ -0,0 +1,214 @@
+"""
+KazSmartChain - Numba proof-of-work kernel
+Optional JIT-compiled nonce search (pip install numba). The header prefix
+is compressed into a SHA-256 midstate once; the kernel then assembles only
+the final block(s) per nonce and runs the compression rounds without
+touching the interpreter.
+"""
+
+import hashlib
+import threading
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is optional; mining.py is the fallback
+    numba = None
+
+AVAILABLE = numba is not None
+
+# Nonces scanned per parallel work item inside the kernel
+JIT_CHUNK = 1 << 14
+
+_MASK = 0xFFFFFFFF
+
+# Streamlit runs every session in its own thread. numba's workqueue threading
+# layer (used when neither TBB nor OpenMP is installed) aborts the process on
+# concurrent entry into a parallel kernel, so calls into _search take turns.
+_SEARCH_LOCK = threading.Lock()
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+
+def _jit(**options):
+    """numba.njit when available, otherwise leave the function as plain Python"""
+    if numba is None:
+        return lambda func: func
+    return numba.njit(cache=True, **options)
+
+
+if numba is not None:
+    _prange = numba.prange
+else:
+    _prange = range
+
+
+@_jit()
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+
+@_jit()
+def _sha256_final_block(state, block, offset, w):
+    """Compress the 64-byte block at ``block[offset:]`` into ``state`` in place.
+
+    ``w`` is a caller-owned 64-word message schedule scratch buffer.
+    """
+    for t in range(16):
+        i = offset + 4 * t
+        w[t] = (block[i] << 24) | (block[i + 1] << 16) | (block[i + 2] << 8) | block[i + 3]
+    for t in range(16, 64):
+        s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+        s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+        w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & _MASK
+
+    a, b, c, d, e, f, g, h = state[0], state[1], state[2], state[3], state[4], state[5], state[6], state[7]
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g & _MASK)
+        t1 = (h + s1 + ch + _K[t] + w[t]) & _MASK
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+
+@_jit()
+def _meets_difficulty(state, difficulty):
+    """True when the digest in ``state`` starts with ``difficulty`` zero nibbles"""
+    full_words = difficulty // 8
+    for i in range(full_words):
+        if state[i] != 0:
+            return False
+    rem = difficulty % 8
+    if rem:
+        return (state[full_words] >> (32 - 4 * rem)) == 0
+    return True
+
+
+@_jit()
+def _try_nonce(midstate, tail, prefix_len, nonce, difficulty, buf, state, w):
+    """Hash ``prefix + str(nonce)`` from the midstate and test the target"""
+    tail_len = tail.shape[0]
+    for i in range(tail_len):
+        buf[i] = tail[i]
+
+    # itoa: count digits, then fill right to left
+    ndigits = 1
+    n = nonce
+    while n >= 10:
+        n //= 10
+        ndigits += 1
+    n = nonce
+    for i in range(ndigits):
+        buf[tail_len + ndigits - 1 - i] = 48 + n % 10
+        n //= 10
+
+    used = tail_len + ndigits
+    nblocks = 1 if used + 9 <= 64 else 2
+    end = 64 * nblocks
+    buf[used] = 0x80
+    for i in range(used + 1, end - 8):
+        buf[i] = 0
+    bit_len = (prefix_len + ndigits) * 8
+    for i in range(8):
+        buf[end - 1 - i] = (bit_len >> (8 * i)) & 0xFF
+
+    for i in range(8):
+        state[i] = midstate[i]
+    for blk in range(nblocks):
+        _sha256_final_block(state, buf, 64 * blk, w)
+    return _meets_difficulty(state, difficulty)
+
+
+@_jit(parallel=True)
+def _search(midstate, tail, prefix_len, difficulty, start, stop):
+    """Return the smallest nonce in [start, stop) meeting the target, or -1"""
+    nchunks = (stop - start + JIT_CHUNK - 1) // JIT_CHUNK
+    hits = np.full(nchunks, -1, dtype=np.int64)
+
+    for c in _prange(nchunks):
+        buf = np.empty(128, dtype=np.int64)
+        state = np.empty(8, dtype=np.int64)
+        w = np.empty(64, dtype=np.int64)
+        lo = start + c * JIT_CHUNK
+        hi = min(lo + JIT_CHUNK, stop)
+        for nonce in range(lo, hi):
+            if _try_nonce(midstate, tail, prefix_len, nonce, difficulty, buf, state, w):
+                hits[c] = nonce
+                break
+
+    for c in range(nchunks):
+        if hits[c] >= 0:
+            return hits[c]
+    return -1
+
+
+def midstate(header_prefix: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Compress every full 64-byte block of the prefix.
+
+    hashlib does not expose its internal state, so the midstate is rebuilt
+    with the same compression function the kernel uses. Returns the state
+    words and the unconsumed tail bytes.
+    """
+    data = np.frombuffer(header_prefix, dtype=np.uint8).astype(np.int64)
+    state = _H0.copy()
+    w = np.empty(64, dtype=np.int64)
+    full = len(header_prefix) // 64 * 64
+    for offset in range(0, full, 64):
+        _sha256_final_block(state, data, offset, w)
+    return state, data[full:].copy()
+
+
+def search(header_prefix: bytes, difficulty_nibbles: int,
+           progress_cb: Optional[Callable[[int], None]] = None) -> Tuple[int, str]:
+    """Find the first nonce meeting the target using the JIT kernel.
+
+    ``progress_cb`` is called with the number of nonces scanned after each
+    batch without a hit.
+    """
+    state, tail = midstate(header_prefix)
+    # One chunk per thread per call keeps every core busy without scanning
+    # far past the winning nonce
+    batch = JIT_CHUNK * (numba.get_num_threads() if numba is not None else 1)
+    start = 0
+
+    while True:
+        with _SEARCH_LOCK:
+            nonce = _search(state, tail, len(header_prefix), difficulty_nibbles, start, start + batch)
+        if nonce >= 0:
+            return int(nonce), hashlib.sha256(header_prefix + b"%d" % nonce).hexdigest()
+        start += batch
+        if progress_cb is not None:
+            progress_cb(start)
@@ -0,0 +1,150 @@
+"""
+KazSmartChain - mempool rules, driven through the Streamlit script
+Transactions queue per chain and are mined into one block when the batch
+is full, when the oldest has waited MEMPOOL_MAX_AGE seconds, or on request.
+Run with: python -m pytest -q test_app.py
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import mining_jit
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Mirrors app.MEMPOOL_MAX_AGE; app.py is a Streamlit script, not a module
+MEMPOOL_MAX_AGE = 30
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_jit():
+    # AppTest runs the script in a worker thread; numba's TBB layer hangs
+    # interpreter exit if its first parallel launch comes from such a thread
+    mining_jit.search(b"", 1)
+
+
+@pytest.fixture
+def at(monkeypatch):
+    monkeypatch.setenv("KAZ_FAST", "1")
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _click(at, label):
+    next(button for button in at.button if button.label == label).click()
+    at.run()
+    assert not at.exception
+
+
+def _block_counts(at):
+    return {chain: len(blocks) for chain, blocks in at.session_state["blocks"].items()}
+
+
+def _backdate(at, tx_id, seconds):
+    tx = at.session_state["tx_index"][tx_id]
+    tx.timestamp = (datetime.fromisoformat(tx.timestamp) - timedelta(seconds=seconds)).isoformat()
+
+
+def _assert_consistent(at):
+    """tx_index and tx_by_chain hold exactly the transaction history; the
+    mempool only holds pending transactions of its own chain"""
+    transactions = at.session_state["transactions"]
+    assert at.session_state["tx_index"] == {tx.id: tx for tx in transactions}
+
+    for chain, by_chain in at.session_state["tx_by_chain"].items():
+        assert by_chain == [tx for tx in transactions if tx.blockchain == chain]
+
+    for chain, pending in at.session_state["mempool"].items():
+        for tx_id in pending:
+            tx = at.session_state["tx_index"][tx_id]
+            assert (tx.blockchain, tx.status) == (chain, "Pending")
+
+
+def _assert_mined(at, chain, tx_ids):
+    block = at.session_state["blocks"][chain][-1]
+    assert block.transactions == tx_ids
+    for tx_id in tx_ids:
+        tx = at.session_state["tx_index"][tx_id]
+        assert (tx.status, tx.block_number) == ("Success", block.index)
+
+
+def test_submit_below_batch_size_stays_pending(at):
+    blocks = _block_counts(at)
+    _click(at, "🚀 Deploy Contract")
+
+    tx = at.session_state["transactions"][-1]
+    assert tx.status == "Pending"
+    assert at.session_state["mempool"]["besu"] == [tx.id]
+    assert _block_counts(at) == blocks
+    assert "Block Number: 1 (pending)" in [code.value for code in at.code]
+    _assert_consistent(at)
+
+
+def test_full_batch_is_mined(at):
+    at.slider(key="mempool_batch_size").set_value(2).run()
+    blocks = _block_counts(at)
+
+    _click(at, "🚀 Deploy Contract")
+    _click(at, "🚀 Deploy Contract")
+
+    assert _block_counts(at) == dict(blocks, besu=blocks["besu"] + 1)
+    assert at.session_state["mempool"]["besu"] == []
+    _assert_mined(at, "besu", [tx.id for tx in at.session_state["transactions"][-2:]])
+    _assert_consistent(at)
+
+
+def test_stale_mempool_is_mined_on_any_chain(at):
+    # Bridging from Fabric while Besu is shown queues the lock on Fabric
+    at.selectbox(key="source_chain").set_value("fabric").run()
+    blocks = _block_counts(at)
+    _click(at, "🌉 Initiate Bridge Transfer")
+
+    lock_id = at.session_state["mempool"]["fabric"][0]
+    _backdate(at, lock_id, MEMPOOL_MAX_AGE - 5)
+    at.run()
+    assert at.session_state["mempool"]["fabric"] == [lock_id]
+
+    _backdate(at, lock_id, 10)
+    at.run()
+    assert not at.exception
+    assert _block_counts(at) == dict(blocks, fabric=blocks["fabric"] + 1)
+    assert at.session_state["mempool"]["fabric"] == []
+    _assert_mined(at, "fabric", [lock_id])
+    _assert_consistent(at)
+
+
+def test_mine_new_block_takes_the_pending_transactions(at):
+    _click(at, "🚀 Deploy Contract")
+    deploy_id = at.session_state["transactions"][-1].id
+    blocks = _block_counts(at)
+
+    _click(at, "⛏️ Mine New Block")
+
+    sample_id = at.session_state["transactions"][-1].id
+    _assert_mined(at, "besu", [deploy_id, sample_id])
+    assert at.session_state["mempool"]["besu"] == []
+    assert [m.value for m in at.metric if m.label == "Total Blocks"] == [str(sum(blocks.values()) + 1)]
+    assert "Block Number: 1" in [code.value for code in at.code]
+    _assert_consistent(at)
+
+
+def test_mine_pending_flushes_every_chain(at):
+    at.selectbox(key="source_chain").set_value("corda").run()
+    _click(at, "🚀 Deploy Contract")
+    _click(at, "🌉 Initiate Bridge Transfer")
+    deploy_id, lock_id = (tx.id for tx in at.session_state["transactions"][-2:])
+    blocks = _block_counts(at)
+
+    at.button(key="mine_pending").click().run()
+    assert not at.exception
+
+    assert _block_counts(at) == dict(blocks, besu=blocks["besu"] + 1, corda=blocks["corda"] + 1)
+    assert all(not pending for pending in at.session_state["mempool"].values())
+    _assert_mined(at, "besu", [deploy_id])
+    _assert_mined(at, "corda", [lock_id])
+    _assert_consistent(at)
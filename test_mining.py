@@ -0,0 +1,168 @@
+"""
+KazSmartChain - proof-of-work backend checks
+The JIT and CUDA miners carry their own SHA-256 rounds and padding; these
+tests pin them to hashlib so a change to either cannot mine invalid blocks.
+Run with: python -m pytest -q test_mining.py
+"""
+
+import ctypes
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import mining
+import mining_gpu
+import mining_jit
+
+# Around the one-block (55/56/64) and two-block (119/120/128) padding edges
+PREFIX_LENGTHS = [0, 1, 2, 3, 31, 32] + list(range(50, 71)) + list(range(110, 133)) + [200, 333]
+
+# Nonce digit counts move the padding byte and the length field
+NONCES = [0, 7, 10, 99, 12345, 10 ** 9, 2 ** 63 - 1]
+
+
+def _prefix(length: int) -> bytes:
+    return (bytes(range(33, 127)) * (length // 94 + 1))[:length]
+
+
+def _state_hex(state: np.ndarray) -> str:
+    return b"".join(int(word).to_bytes(4, "big") for word in state).hex()
+
+
+def _meets(hash_hex: str, difficulty: int) -> bool:
+    return hash_hex.startswith("0" * difficulty)
+
+
+@pytest.mark.parametrize("length", PREFIX_LENGTHS)
+def test_jit_digest_matches_hashlib(length):
+    prefix = _prefix(length)
+    midstate, tail = mining_jit.midstate(prefix)
+    buf = np.empty(128, dtype=np.int64)
+    state = np.empty(8, dtype=np.int64)
+    w = np.empty(64, dtype=np.int64)
+
+    for nonce in NONCES:
+        mining_jit._try_nonce(midstate, tail, len(prefix), nonce, 0, buf, state, w)
+        expected = hashlib.sha256(prefix + b"%d" % nonce).hexdigest()
+        assert _state_hex(state) == expected, (length, nonce)
+
+
+@pytest.mark.parametrize("length", PREFIX_LENGTHS)
+def test_backends_find_the_first_valid_nonce(length):
+    prefix = _prefix(length)
+    difficulty = 2
+    nonce, hash_hex = mining.mine(prefix, difficulty)
+
+    assert hash_hex == hashlib.sha256(prefix + b"%d" % nonce).hexdigest()
+    assert _meets(hash_hex, difficulty)
+    assert not any(
+        _meets(hashlib.sha256(prefix + b"%d" % n).hexdigest(), difficulty) for n in range(nonce)
+    )
+
+    # The JIT kernel decides hits with its own rounds; it must agree on the nonce
+    assert mining_jit.search(prefix, difficulty) == (nonce, hash_hex)
+
+
+def test_mine_parallel_matches_hashlib():
+    prefix = _prefix(64)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        nonce, hash_hex = mining.mine_parallel(prefix, 3, executor, 4)
+
+    assert hash_hex == hashlib.sha256(prefix + b"%d" % nonce).hexdigest()
+    assert _meets(hash_hex, 3)
+
+
+def test_progress_reports_nonces_scanned_before_the_hit():
+    # The first hit for this prefix lies five chunks in
+    prefix = _prefix(41)
+    difficulty = 4
+    reported = {}
+
+    for name, search in [
+        ("mine", lambda cb: mining.mine(prefix, difficulty, cb)),
+        ("jit", lambda cb: mining_jit.search(prefix, difficulty, cb)),
+    ]:
+        scanned = reported[name] = []
+        nonce, _ = search(scanned.append)
+        assert scanned == sorted(scanned) and len(set(scanned)) == len(scanned), name
+        assert all(n <= nonce for n in scanned), name
+
+    # The hashlib miner reports once per chunk it scanned without a hit
+    nonce, _ = mining.mine(prefix, difficulty)
+    assert nonce // mining.MINING_CHUNK == 5
+    assert reported["mine"] == [mining.MINING_CHUNK * (i + 1) for i in range(nonce // mining.MINING_CHUNK)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scanned = []
+        mining.mine_parallel(prefix, difficulty, executor, 2, scanned.append)
+    assert scanned and scanned == sorted(scanned) and all(n % mining.MINING_CHUNK == 0 for n in scanned)
+
+
+def test_difficulty_threshold_matches_hex_prefix():
+    for difficulty in range(0, 9):
+        threshold = mining.difficulty_threshold(difficulty)
+        for nonce in range(2000):
+            digest = hashlib.sha256(b"kaz%d" % nonce).digest()
+            assert (digest < threshold) == _meets(digest.hex(), difficulty)
+
+
+# Host build of sha256_mine.cu: the CUDA qualifiers compile away and a single
+# "thread" runs per call, so the kernel's rounds and padding are checked
+# without a GPU
+_HOST_SHIM = r"""
+#include <algorithm>
+#define __constant__
+#define __device__
+#define __forceinline__ inline
+#define __global__
+struct dim3_ { unsigned long long x; };
+static dim3_ blockIdx = {0}, blockDim = {1}, threadIdx = {0};
+static void atomicMin(unsigned long long *a, unsigned long long v) { *a = std::min(*a, v); }
+#include "sha256_mine.cu"
+"""
+
+
+@pytest.fixture(scope="module")
+def host_kernel(tmp_path_factory):
+    cxx = shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")
+    if cxx is None:
+        pytest.skip("no C++ compiler")
+    build = tmp_path_factory.mktemp("cuda_host")
+    shim = build / "shim.cpp"
+    shim.write_text(_HOST_SHIM)
+    lib = build / "sha256_mine.so"
+    subprocess.run([cxx, "-O2", "-shared", "-fPIC",
+                    "-I", os.path.dirname(mining_gpu.KERNEL_PATH),
+                    "-o", str(lib), str(shim)], check=True)
+    kernel = ctypes.CDLL(str(lib)).mine
+    kernel.restype = None
+    kernel.argtypes = [ctypes.POINTER(ctypes.c_uint32), ctypes.POINTER(ctypes.c_uint8), ctypes.c_uint32,
+                       ctypes.c_uint64, ctypes.c_uint64, ctypes.c_uint32, ctypes.POINTER(ctypes.c_uint64)]
+    return kernel
+
+
+@pytest.mark.parametrize("length", PREFIX_LENGTHS)
+def test_cuda_kernel_hits_match_hashlib(host_kernel, length):
+    prefix = _prefix(length)
+    midstate, tail = mining_jit.midstate(prefix)
+    state = (ctypes.c_uint32 * 8)(*midstate.tolist())
+    tail_buf = (ctypes.c_uint8 * max(len(tail), 1))(*tail.tolist())
+    difficulty = 1
+
+    for nonce in list(range(300)) + NONCES:
+        out = ctypes.c_uint64(2 ** 64 - 1)
+        host_kernel(state, tail_buf, len(tail), len(prefix), nonce, difficulty, ctypes.byref(out))
+        hit = _meets(hashlib.sha256(prefix + b"%d" % nonce).hexdigest(), difficulty)
+        assert (out.value == nonce) == hit, (length, nonce)
+
+
+@pytest.mark.skipif(not mining_gpu.AVAILABLE, reason="no CUDA device / cupy")
+@pytest.mark.parametrize("length", PREFIX_LENGTHS)
+def test_gpu_finds_the_first_valid_nonce(length):
+    prefix = _prefix(length)
+    assert mining_gpu.search(prefix, 2) == mining.mine(prefix, 2)